@@ -56,6 +56,13 @@ from app.resilience import _get_from_cache, _set_cache, circuit_breaker
 logger = get_logger(__name__)
 activity.logger = logger
 
+# manifest parsing patterns, compiled once at import
+_REQUIREMENT_RE = re.compile(r"([^=<>!~\s]+)(==|>=|<=|>|<|~=)?(.+)?")
+_POM_DEPENDENCY_RE = re.compile(r"<dependency>.*?</dependency>", flags=re.S)
+_POM_GROUP_RE = re.compile(r"<groupId>(.*?)</groupId>")
+_POM_ARTIFACT_RE = re.compile(r"<artifactId>(.*?)</artifactId>")
+_POM_VERSION_RE = re.compile(r"<version>(.*?)</version>")
+
 
 class GitHubMetadataActivities(ActivitiesInterface):
     def __init__(self):
@@ -395,7 +402,7 @@ class GitHubMetadataActivities(ActivitiesInterface):
                     line = line.strip()
                     if not line or line.startswith("#"):
                         continue
-                    m = re.match(r"([^=<>!~\s]+)(==|>=|<=|>|<|~=)?(.+)?", line)
+                    m = _REQUIREMENT_RE.match(line)
                     if m:
                         deps.append({"name": m.group(1), "version": (m.group(3) or "").strip()})
             elif manifest_name == "pyproject.toml":
@@ -403,11 +410,11 @@ class GitHubMetadataActivities(ActivitiesInterface):
                     if "name =" in line or "version =" in line:
                         continue
             elif manifest_name == "pom.xml":
-                for match in re.finditer(r"<dependency>.*?</dependency>", text, flags=re.S):
+                for match in _POM_DEPENDENCY_RE.finditer(text):
                     block = match.group(0)
-                    group = re.search(r"<groupId>(.*?)</groupId>", block)
-                    artifact = re.search(r"<artifactId>(.*?)</artifactId>", block)
-                    version = re.search(r"<version>(.*?)</version>", block)
+                    group = _POM_GROUP_RE.search(block)
+                    artifact = _POM_ARTIFACT_RE.search(block)
+                    version = _POM_VERSION_RE.search(block)
                     deps.append({
                         "group": group.group(1) if group else None,
                         "artifact": artifact.group(1) if artifact else None,
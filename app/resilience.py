@@ -25,10 +25,13 @@ class CircuitState(Enum):
     HALF_OPEN = "half_open"
 
 class CircuitBreaker:
-    def __init__(self, failure_threshold=3, recovery_timeout=30, name="default"):
+    def __init__(self, failure_threshold=3, recovery_timeout=30, name="default",
+                 time_source: Callable[[], float] = time.monotonic):
         self.failure_threshold = failure_threshold
         self.recovery_timeout = recovery_timeout
         self.name = name
+        # monotonic by default so wall-clock jumps can't skew the recovery window; injectable for tests
+        self._time = time_source
         self.failure_count = 0
         self.last_failure_time = None
         self.state = CircuitState.CLOSED
@@ -64,7 +67,7 @@ class CircuitBreaker:
     def _should_attempt_reset(self) -> bool:
         if self.last_failure_time is None:
             return True
-        return time.time() - self.last_failure_time >= self.recovery_timeout
+        return self._time() - self.last_failure_time >= self.recovery_timeout
     
     def _on_success(self):
         with self._lock:
@@ -76,7 +79,7 @@ class CircuitBreaker:
     def _on_failure(self):
         with self._lock:
             self.failure_count += 1
-            self.last_failure_time = time.time()
+            self.last_failure_time = self._time()
             if self.failure_count >= self.failure_threshold:
                 self.state = CircuitState.OPEN
                 logger.warning(f"Circuit breaker {self.name} opened after {self.failure_count} failures")
@@ -88,6 +91,8 @@ class CircuitBreaker:
 #
 _cache: Dict[str, Dict[str, Any]] = {}
 _cache_lock = threading.Lock()
+# monotonic clock for ttl checks; module-level so tests can swap it
+_now = time.monotonic
 
 def _generate_cache_key(repo_url: str, activity_type: str, **kwargs) -> str:
     key_data = {
@@ -103,7 +108,7 @@ def _get_from_cache(repo_url: str, activity_type: str, **kwargs) -> Optional[Any
     with _cache_lock:
         if key in _cache:
             entry = _cache[key]
-            if time.time() < entry["expires_at"]:
+            if _now() < entry["expires_at"]:
                 logger.debug(f"cache hit for {activity_type} - {repo_url}")
                 return entry["data"]
             else:
@@ -116,7 +121,7 @@ def _set_cache(repo_url: str, activity_type: str, data: Any, ttl: int = 600, **k
     with _cache_lock:
         _cache[key] = {
             "data": data,
-            "expires_at": time.time() + ttl
+            "expires_at": _now() + ttl
         }
         logger.debug(f"cached {activity_type} for {repo_url} (ttl: {ttl}s)")
 
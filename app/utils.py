@@ -1,9 +1,11 @@
+import functools
 import re
 import uuid
 from datetime import timezone
 from typing import Tuple
 from urllib.parse import urlparse
 
+@functools.lru_cache(maxsize=1024)
 def parse_repo_url(repo_url: str) -> Tuple[str, str]:
     """
     Parse a GitHub repo URL and return (owner, repo)
@@ -4,24 +4,83 @@ Tests activities with mocked GitHub API calls and real component interactions.
 """
 import pytest
 import asyncio
-from unittest.mock import Mock, patch, AsyncMock
+from dataclasses import dataclass
+from unittest.mock import Mock, AsyncMock
 from datetime import datetime, timezone
 
-from app.activities import GitHubMetadataActivities
+from app import resilience
+
+_NEW_YEAR_2023 = datetime(2023, 1, 1, tzinfo=timezone.utc)
+
+
+@dataclass(slots=True)
+class _Author:
+    name: str
+    email: str
+    date: datetime
+
+
+@dataclass(slots=True)
+class _CommitDetail:
+    message: str
+    author: _Author
+
+
+@dataclass(slots=True)
+class _Commit:
+    """Plain stand-in for a PyGithub commit; only the fields extraction reads."""
+    sha: str
+    commit: _CommitDetail
+    html_url: str
+
+
+def _make_small_repo():
+    """Build a minimal unlicensed repository mock shared by the decorator tests."""
+    return Mock(
+        full_name="test/repo",
+        html_url="https://github.com/test/repo",
+        description="Test repo",
+        language="Python",
+        get_languages=Mock(return_value={"Python": 100}),
+        stargazers_count=10,
+        forks_count=5,
+        open_issues_count=2,
+        created_at=_NEW_YEAR_2023,
+        updated_at=_NEW_YEAR_2023,
+        default_branch="main",
+        fork=False,
+        get_license=Mock(return_value=None)
+    )
+
+
+@pytest.fixture(scope="module")
+def ten_commits():
+    """Ten mock commits built once per module; extraction only reads them."""
+    return tuple(
+        _Commit(
+            sha=f"commit{i}",
+            commit=_CommitDetail(
+                message=f"Test commit {i}",
+                author=_Author(
+                    name=f"Author {i}",
+                    email=f"author{i}@example.com",
+                    date=_NEW_YEAR_2023
+                )
+            ),
+            html_url=f"https://github.com/test/repo/commit/commit{i}"
+        )
+        for i in range(10)
+    )
 
 
 class TestGitHubMetadataActivitiesComponent:
     """Component tests for GitHubMetadataActivities."""
 
     @pytest.fixture
-    def activities(self):
-        """Create activities instance with mocked GitHub client."""
-        with patch('app.activities.Github') as mock_github_class:
-            mock_github = Mock()
-            mock_github_class.return_value = mock_github
-            activities = GitHubMetadataActivities()
-            activities.github = mock_github
-            return activities
+    def activities(self, session_activities):
+        """Session activities instance with its GitHub client mock reset per test."""
+        session_activities.github.reset_mock(return_value=True, side_effect=True)
+        return session_activities
 
     @pytest.fixture
     def mock_repo(self):
@@ -307,21 +366,7 @@ class TestGitHubMetadataActivitiesComponent:
         """Test that activities work with circuit breaker protection."""
         # This test verifies that the circuit breaker decorator doesn't interfere
         # with normal operation
-        activities.github.get_repo.return_value = Mock(
-            full_name="test/repo",
-            html_url="https://github.com/test/repo",
-            description="Test repo",
-            language="Python",
-            get_languages=Mock(return_value={"Python": 100}),
-            stargazers_count=10,
-            forks_count=5,
-            open_issues_count=2,
-            created_at=datetime(2023, 1, 1, tzinfo=timezone.utc),
-            updated_at=datetime(2023, 1, 1, tzinfo=timezone.utc),
-            default_branch="main",
-            fork=False,
-            get_license=Mock(return_value=None)
-        )
+        activities.github.get_repo.return_value = _make_small_repo()
         
         result = await activities.extract_repository_metadata([
             "https://github.com/test/repo", "test123"
@@ -334,21 +379,7 @@ class TestGitHubMetadataActivitiesComponent:
     async def test_activity_caching_behavior(self, activities):
         """Test activity caching behavior."""
         # This test verifies that activities work with caching
-        activities.github.get_repo.return_value = Mock(
-            full_name="test/repo",
-            html_url="https://github.com/test/repo",
-            description="Test repo",
-            language="Python",
-            get_languages=Mock(return_value={"Python": 100}),
-            stargazers_count=10,
-            forks_count=5,
-            open_issues_count=2,
-            created_at=datetime(2023, 1, 1, tzinfo=timezone.utc),
-            updated_at=datetime(2023, 1, 1, tzinfo=timezone.utc),
-            default_branch="main",
-            fork=False,
-            get_license=Mock(return_value=None)
-        )
+        activities.github.get_repo.return_value = _make_small_repo()
         
         # First call
         result1 = await activities.extract_repository_metadata([
@@ -364,25 +395,32 @@ class TestGitHubMetadataActivitiesComponent:
         assert result1["stars"] == result2["stars"]
 
     @pytest.mark.asyncio
-    async def test_activity_with_different_limits(self, activities):
-        """Test activities with different limits."""
-        mock_commits = [
-            Mock(
-                sha=f"commit{i}",
-                commit=Mock(
-                    message=f"Test commit {i}",
-                    author=Mock(
-                        name=f"Author {i}",
-                        email=f"author{i}@example.com",
-                        date=datetime(2023, 1, 1, tzinfo=timezone.utc)
-                    )
+    async def test_extract_commit_metadata_cache_hit_returns_same_list(self, activities, monkeypatch):
+        """Test a cached commit extraction is handed back by reference without refetching."""
+        # Start from an empty cache so the first call is always a miss
+        monkeypatch.setattr(resilience, "_cache", {})
+        activities.github.get_repo.return_value.get_commits.return_value = [
+            _Commit(
+                sha="abc123",
+                commit=_CommitDetail(
+                    message="Test commit",
+                    author=_Author(name="Author", email="author@example.com", date=_NEW_YEAR_2023)
                 ),
-                html_url=f"https://github.com/test/repo/commit/commit{i}"
+                html_url="https://github.com/test/repo/commit/abc123"
             )
-            for i in range(10)
         ]
+        args = ["https://github.com/test/commit-cache", 5, "test123"]
         
-        activities.github.get_repo.return_value.get_commits.return_value = mock_commits
+        first = await activities.extract_commit_metadata(args)
+        second = await activities.extract_commit_metadata(args)
+        
+        assert second is first
+        activities.github.get_repo.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_activity_with_different_limits(self, activities, ten_commits):
+        """Test activities with different limits."""
+        activities.github.get_repo.return_value.get_commits.return_value = ten_commits
         
         # Test with limit of 5
         result = await activities.extract_commit_metadata([
@@ -5,24 +5,54 @@ Tests complete workflow integration without full Temporal execution.
 import pytest
 import asyncio
 import json
-import tempfile
 import os
 from pathlib import Path
 from unittest.mock import Mock, patch, AsyncMock
 from datetime import datetime, timezone
 
 from app.workflow import GitHubMetadataWorkflow
+from app import activities as activities_module
 from app.activities import GitHubMetadataActivities
 
+_WORKFLOW_INTERFACE = (
+    "run",
+    "get_activities",
+    "_extract_parameters",
+    "_validate_inputs",
+    "_build_combined_metadata",
+)
+
+_ACTIVITIES_INTERFACE = (
+    "extract_repository_metadata",
+    "extract_commit_metadata",
+    "extract_issues_metadata",
+    "extract_pull_requests_metadata",
+    "extract_contributors",
+    "extract_dependencies_from_repo",
+    "save_metadata_to_file",
+    "get_extraction_summary",
+)
+
 
 class TestIntegration:
     """Integration tests for complete workflow."""
 
-    @pytest.fixture
-    def temp_metadata_dir(self):
-        """Create temporary metadata directory."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            yield temp_dir
+    @pytest.fixture(autouse=True)
+    def mock_github(self, monkeypatch):
+        """Stub the GitHub client once per test instead of per-block patching."""
+        mock_github = Mock()
+        monkeypatch.setattr(activities_module, "Github", Mock(return_value=mock_github))
+        return mock_github
+
+    @pytest.fixture(scope="class")
+    def workflow(self):
+        """Create workflow instance, reused by every test in the class."""
+        return GitHubMetadataWorkflow()
+
+    @pytest.fixture(scope="class")
+    def temp_metadata_dir(self, tmp_path_factory):
+        """Create temporary metadata directory once for the class."""
+        return str(tmp_path_factory.mktemp("metadata"))
 
     @pytest.fixture
     def mock_github_data(self):
@@ -126,76 +156,68 @@ class TestIntegration:
         }
 
     @pytest.mark.asyncio
-    async def test_workflow_activities_integration(self, temp_metadata_dir, mock_github_data, workflow_config):
+    async def test_workflow_activities_integration(self, workflow, temp_metadata_dir, mock_github, mock_github_data, workflow_config):
         """Test integration between workflow and activities components."""
         with patch.dict(os.environ, {"METADATA_DIR": temp_metadata_dir}):
-            with patch('app.activities.Github') as mock_github_class:
-                # Setup mock GitHub client
-                mock_github = Mock()
-                mock_github_class.return_value = mock_github
-                
-                # Setup mock repository
-                mock_repo = mock_github_data["repo"]
-                mock_github.get_repo.return_value = mock_repo
-                
-                # Setup mock data for different activities
-                mock_repo.get_commits.return_value = mock_github_data["commits"]
-                mock_repo.get_issues.return_value = mock_github_data["issues"]
-                mock_repo.get_pulls.return_value = mock_github_data["pull_requests"]
-                mock_repo.get_contributors.return_value = mock_github_data["contributors"]
-                mock_repo.get_contents.return_value = mock_github_data["dependencies"]
-                
-                # Create activities and workflow
-                activities = GitHubMetadataActivities()
-                workflow = GitHubMetadataWorkflow()
-                
-                # Test individual activity execution
-                repo_metadata = await activities.extract_repository_metadata([
-                    "https://github.com/facebook/react", "test123"
-                ])
-                
-                commits = await activities.extract_commit_metadata([
-                    "https://github.com/facebook/react", 50, "test123"
-                ])
-                
-                issues = await activities.extract_issues_metadata([
-                    "https://github.com/facebook/react", 30, "test123"
-                ])
-                
-                pull_requests = await activities.extract_pull_requests_metadata([
-                    "https://github.com/facebook/react", 20, "test123"
-                ])
-                
-                contributors = await activities.extract_contributors([
-                    "https://github.com/facebook/react", "test123"
-                ])
-                
-                dependencies = await activities.extract_dependencies_from_repo([
-                    "https://github.com/facebook/react", "test123"
-                ])
-                
-                # Test workflow metadata combination
-                normalized_selections = workflow._extract_parameters(workflow_config, {})[4]
-                combined_metadata = workflow._build_combined_metadata(
-                    repo_metadata, commits, issues, pull_requests, contributors, dependencies,
-                    None, None, None, None, None, None, None, normalized_selections
-                )
-                
-                # Verify integration results
-                assert combined_metadata["repository"] == "facebook/react"
-                assert combined_metadata["stars"] == 200000
-                assert len(combined_metadata["commits"]) == 1
-                assert len(combined_metadata["issues"]) == 1
-                assert len(combined_metadata["pull_requests"]) == 1
-                assert len(combined_metadata["contributors"]) == 1
-                # Dependencies may be empty depending on parsing
-                assert isinstance(combined_metadata["dependencies"], list)
+            # Setup mock repository
+            mock_repo = mock_github_data["repo"]
+            mock_github.get_repo.return_value = mock_repo
+            
+            # Setup mock data for different activities
+            mock_repo.get_commits.return_value = mock_github_data["commits"]
+            mock_repo.get_issues.return_value = mock_github_data["issues"]
+            mock_repo.get_pulls.return_value = mock_github_data["pull_requests"]
+            mock_repo.get_contributors.return_value = mock_github_data["contributors"]
+            mock_repo.get_contents.return_value = mock_github_data["dependencies"]
+            
+            # Create activities
+            activities = GitHubMetadataActivities()
+            
+            # Test individual activity execution
+            repo_metadata = await activities.extract_repository_metadata([
+                "https://github.com/facebook/react", "test123"
+            ])
+            
+            commits = await activities.extract_commit_metadata([
+                "https://github.com/facebook/react", 50, "test123"
+            ])
+            
+            issues = await activities.extract_issues_metadata([
+                "https://github.com/facebook/react", 30, "test123"
+            ])
+            
+            pull_requests = await activities.extract_pull_requests_metadata([
+                "https://github.com/facebook/react", 20, "test123"
+            ])
+            
+            contributors = await activities.extract_contributors([
+                "https://github.com/facebook/react", "test123"
+            ])
+            
+            dependencies = await activities.extract_dependencies_from_repo([
+                "https://github.com/facebook/react", "test123"
+            ])
+            
+            # Test workflow metadata combination
+            normalized_selections = workflow._extract_parameters(workflow_config, {})[4]
+            combined_metadata = workflow._build_combined_metadata(
+                repo_metadata, commits, issues, pull_requests, contributors, dependencies,
+                None, None, None, None, None, None, None, normalized_selections
+            )
+            
+            # Verify integration results
+            assert combined_metadata["repository"] == "facebook/react"
+            assert combined_metadata["stars"] == 200000
+            assert len(combined_metadata["commits"]) == 1
+            assert len(combined_metadata["issues"]) == 1
+            assert len(combined_metadata["pull_requests"]) == 1
+            assert len(combined_metadata["contributors"]) == 1
+            # Dependencies may be empty depending on parsing
+            assert isinstance(combined_metadata["dependencies"], list)
 
     @pytest.mark.asyncio
-    async def test_workflow_parameter_flow_integration(self, workflow_config):
+    async def test_workflow_parameter_flow_integration(self, workflow, workflow_config):
         """Test parameter flow through workflow components."""
-        workflow = GitHubMetadataWorkflow()
-        
         # Test parameter extraction
         repo_url, commit_limit, issues_limit, pr_limit, normalized_selections = workflow._extract_parameters(
             workflow_config, {}
@@ -230,59 +252,52 @@ class TestIntegration:
         assert result["dependencies"] == [{"name": "dep1"}]
 
     @pytest.mark.asyncio
-    async def test_activities_data_flow_integration(self, temp_metadata_dir, mock_github_data):
+    async def test_activities_data_flow_integration(self, temp_metadata_dir, mock_github, mock_github_data):
         """Test data flow through activities."""
         with patch.dict(os.environ, {"METADATA_DIR": temp_metadata_dir}):
-            with patch('app.activities.Github') as mock_github_class:
-                mock_github = Mock()
-                mock_github_class.return_value = mock_github
-                mock_github.get_repo.return_value = mock_github_data["repo"]
-                
-                activities = GitHubMetadataActivities()
-                
-                # Test data flow through multiple activities
-                repo_metadata = await activities.extract_repository_metadata([
-                    "https://github.com/facebook/react", "test123"
-                ])
-                
-                # Verify repository metadata structure
-                assert "repository" in repo_metadata
-                assert "stars" in repo_metadata
-                assert "forks" in repo_metadata
-                assert "extraction_provenance" in repo_metadata
-                
-                # Test summary generation
-                summary = await activities.get_extraction_summary([
-                    "https://github.com/facebook/react", repo_metadata, "test123"
-                ])
-                
-                # Verify summary structure
-                assert "repository" in summary
-                assert "stars" in summary
-                assert "forks" in summary
+            mock_github.get_repo.return_value = mock_github_data["repo"]
+            
+            activities = GitHubMetadataActivities()
+            
+            # Test data flow through multiple activities
+            repo_metadata = await activities.extract_repository_metadata([
+                "https://github.com/facebook/react", "test123"
+            ])
+            
+            # Verify repository metadata structure
+            assert "repository" in repo_metadata
+            assert "stars" in repo_metadata
+            assert "forks" in repo_metadata
+            assert "extraction_provenance" in repo_metadata
+            
+            # Test summary generation
+            summary = await activities.get_extraction_summary([
+                "https://github.com/facebook/react", repo_metadata, "test123"
+            ])
+            
+            # Verify summary structure
+            assert "repository" in summary
+            assert "stars" in summary
+            assert "forks" in summary
 
     @pytest.mark.asyncio
-    async def test_error_handling_integration(self, temp_metadata_dir, workflow_config):
+    async def test_error_handling_integration(self, workflow, temp_metadata_dir, mock_github, workflow_config):
         """Test error handling integration across components."""
         with patch.dict(os.environ, {"METADATA_DIR": temp_metadata_dir}):
-            with patch('app.activities.Github') as mock_github_class:
-                # Make GitHub API fail
-                mock_github = Mock()
-                mock_github_class.return_value = mock_github
-                mock_github.get_repo.side_effect = Exception("API Error")
-                
-                activities = GitHubMetadataActivities()
-                workflow = GitHubMetadataWorkflow()
-                
-                # Test activity error handling
-                with pytest.raises(Exception, match="RetryError"):
-                    await activities.extract_repository_metadata([
-                        "https://github.com/facebook/react", "test123"
-                    ])
-                
-                # Test workflow error handling
-                with pytest.raises(ValueError, match="Repository URL is required"):
-                    workflow._validate_inputs("", {"repository": True}, "test123")
+            # Make GitHub API fail
+            mock_github.get_repo.side_effect = Exception("API Error")
+            
+            activities = GitHubMetadataActivities()
+            
+            # Test activity error handling
+            with pytest.raises(Exception, match="RetryError"):
+                await activities.extract_repository_metadata([
+                    "https://github.com/facebook/react", "test123"
+                ])
+            
+            # Test workflow error handling
+            with pytest.raises(ValueError, match="Repository URL is required"):
+                workflow._validate_inputs("", {"repository": True}, "test123")
 
     def test_frontend_backend_integration(self, workflow_config):
         """Test that frontend configuration matches backend expectations."""
@@ -332,8 +347,6 @@ class TestIntegration:
 
     def test_workflow_parameter_validation_integration(self, workflow_config):
         """Test workflow parameter validation integration."""
-        workflow = GitHubMetadataWorkflow()
-        
         # Test valid configuration
         assert workflow_config["repo_url"] == "https://github.com/facebook/react"
         assert workflow_config["commit_limit"] == 50
@@ -373,27 +386,16 @@ class TestIntegration:
             assert key in repo_metadata_structure
             assert isinstance(expected_type, type)
 
-    def test_component_interfaces_integration(self):
+    def test_component_interfaces_integration(self, workflow):
         """Test that component interfaces are properly integrated."""
         # Test workflow interface
-        workflow = GitHubMetadataWorkflow()
-        assert hasattr(workflow, 'run')
-        assert hasattr(workflow, 'get_activities')
-        assert hasattr(workflow, '_extract_parameters')
-        assert hasattr(workflow, '_validate_inputs')
-        assert hasattr(workflow, '_build_combined_metadata')
+        missing = [name for name in _WORKFLOW_INTERFACE if not hasattr(workflow, name)]
+        assert not missing, missing
         
         # Test activities interface
-        with patch('app.activities.Github'):
-            activities = GitHubMetadataActivities()
-            assert hasattr(activities, 'extract_repository_metadata')
-            assert hasattr(activities, 'extract_commit_metadata')
-            assert hasattr(activities, 'extract_issues_metadata')
-            assert hasattr(activities, 'extract_pull_requests_metadata')
-            assert hasattr(activities, 'extract_contributors')
-            assert hasattr(activities, 'extract_dependencies_from_repo')
-            assert hasattr(activities, 'save_metadata_to_file')
-            assert hasattr(activities, 'get_extraction_summary')
+        activities = GitHubMetadataActivities()
+        missing = [name for name in _ACTIVITIES_INTERFACE if not hasattr(activities, name)]
+        assert not missing, missing
 
     def test_data_consistency_integration(self, mock_github_data):
         """Test data consistency across integration points."""
@@ -415,10 +417,8 @@ class TestIntegration:
         assert hasattr(commit_data, 'commit')
         assert hasattr(commit_data, 'html_url')
 
-    def test_workflow_metadata_filtering_integration(self, workflow_config):
+    def test_workflow_metadata_filtering_integration(self, workflow, workflow_config):
         """Test workflow metadata filtering integration."""
-        workflow = GitHubMetadataWorkflow()
-        
         # Test with only repository selected
         normalized_selections = {
             "repository": True,
@@ -442,14 +442,10 @@ class TestIntegration:
         )
         
         assert "repository" in result
-        assert "commits" not in result
-        assert "issues" not in result
-        assert "pull_requests" not in result
+        assert not {"commits", "issues", "pull_requests"} & result.keys()
 
-    def test_parameter_validation_integration(self, workflow_config):
+    def test_parameter_validation_integration(self, workflow, workflow_config):
         """Test parameter validation integration."""
-        workflow = GitHubMetadataWorkflow()
-        
         # Test parameter extraction and validation
         repo_url, commit_limit, issues_limit, pr_limit, normalized_selections = workflow._extract_parameters(
             workflow_config, {}
@@ -466,10 +462,8 @@ class TestIntegration:
             empty_selections = {key: False for key in normalized_selections}
             workflow._validate_inputs(repo_url, empty_selections, "test123")
 
-    def test_workflow_selections_normalization(self, workflow_config):
+    def test_workflow_selections_normalization(self, workflow, workflow_config):
         """Test workflow selections normalization."""
-        workflow = GitHubMetadataWorkflow()
-        
         # Test with partial selections
         partial_config = {
             "repo_url": "https://github.com/test/repo",
@@ -499,10 +493,8 @@ class TestIntegration:
         assert normalized_selections["issues"] is False
         assert normalized_selections["pull_requests"] is False  # Default
 
-    def test_workflow_metadata_combination_edge_cases(self, workflow_config):
+    def test_workflow_metadata_combination_edge_cases(self, workflow, workflow_config):
         """Test workflow metadata combination edge cases."""
-        workflow = GitHubMetadataWorkflow()
-        
         # Test with None values
         normalized_selections = {
             "repository": True,
@@ -526,14 +518,10 @@ class TestIntegration:
         )
         
         assert result["repository"] == "test/repo"
-        assert "commits" not in result
-        assert "issues" not in result
-        assert "pull_requests" not in result
+        assert not {"commits", "issues", "pull_requests"} & result.keys()
 
-    def test_workflow_parameter_defaults(self, workflow_config):
+    def test_workflow_parameter_defaults(self, workflow, workflow_config):
         """Test workflow parameter defaults."""
-        workflow = GitHubMetadataWorkflow()
-        
         # Test with minimal config
         minimal_config = {
             "repo_url": "https://github.com/test/repo",
@@ -549,4 +537,4 @@ class TestIntegration:
         assert issues_limit == 200  # Default from config
         assert pr_limit == 200  # Default from config
         assert normalized_selections["repository"] is True
-        assert all(not value for key, value in normalized_selections.items() if key != "repository")
+        assert {key for key, value in normalized_selections.items() if value} == {"repository"}
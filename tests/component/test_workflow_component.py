@@ -3,43 +3,40 @@ Component tests for GitHubMetadataWorkflow.
 Tests workflow components and helper methods without full Temporal context.
 """
 import pytest
-from unittest.mock import Mock, patch, AsyncMock
-from datetime import timedelta
+from types import MappingProxyType
 
 from app.workflow import GitHubMetadataWorkflow
 from app.activities import GitHubMetadataActivities
+from workflow_samples import ALL_FALSE_SELECTIONS, COMBINED_INPUTS
+
+_EXPECTED_KEYS = frozenset(ALL_FALSE_SELECTIONS)
+
+# Read-only minimal args; _extract_parameters never mutates its input.
+_REPOSITORY_ONLY_ARGS = MappingProxyType({
+    "repo_url": "https://github.com/test/repo",
+    "selections": MappingProxyType({"repository": True}),
+})
 
 
 class TestGitHubMetadataWorkflowComponent:
     """Component tests for GitHubMetadataWorkflow."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def workflow(self):
-        """Create workflow instance."""
+        """Create workflow instance; the helpers keep no per-run state."""
         return GitHubMetadataWorkflow()
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def sample_workflow_args(self):
-        """Sample workflow arguments."""
+        """Sample workflow arguments; read-only, so shared across the class."""
         return {
             "repo_url": "https://github.com/test/repo",
             "commit_limit": 50,
             "issues_limit": 30,
             "pr_limit": 20,
             "selections": {
-                "repository": True,
-                "commits": True,
-                "issues": False,
-                "pull_requests": True,
-                "contributors": False,
-                "dependencies": True,
-                "fork_lineage": False,
-                "commit_lineage": False,
-                "bus_factor": False,
-                "pr_metrics": False,
-                "issue_metrics": False,
-                "commit_activity": False,
-                "release_cadence": False
+                **ALL_FALSE_SELECTIONS,
+                "repository": True, "commits": True, "pull_requests": True, "dependencies": True,
             }
         }
 
@@ -62,143 +59,103 @@ class TestGitHubMetadataWorkflowComponent:
     def test_validate_inputs_component(self, workflow):
         """Test input validation component."""
         repo_url = "https://github.com/test/repo"
-        normalized_selections = {
-            "repository": True,
-            "commits": False,
-            "issues": True,
-            "pull_requests": False,
-            "contributors": False,
-            "dependencies": False,
-            "fork_lineage": False,
-            "commit_lineage": False,
-            "bus_factor": False,
-            "pr_metrics": False,
-            "issue_metrics": False,
-            "commit_activity": False,
-            "release_cadence": False
-        }
+        normalized_selections = {**ALL_FALSE_SELECTIONS, "repository": True, "issues": True}
         
         # Should not raise exception
         workflow._validate_inputs(repo_url, normalized_selections, "test123")
 
-    def test_validate_inputs_no_repo_url(self, workflow):
-        """Test input validation with missing repo URL."""
-        repo_url = ""
-        normalized_selections = {"repository": True}
-        
-        with pytest.raises(ValueError, match="Repository URL is required"):
+    @pytest.mark.parametrize("repo_url,normalized_selections,match", [
+        ("", {"repository": True}, "Repository URL is required"),
+        (
+            "https://github.com/test/repo",
+            ALL_FALSE_SELECTIONS.copy(),
+            "At least one metadata type must be selected",
+        ),
+    ], ids=["no_repo_url", "no_selections"])
+    def test_validate_inputs_errors(self, workflow, repo_url, normalized_selections, match):
+        """Test input validation rejects missing repo URL and empty selections."""
+        with pytest.raises(ValueError, match=match):
             workflow._validate_inputs(repo_url, normalized_selections, "test123")
 
-    def test_validate_inputs_no_selections(self, workflow):
-        """Test input validation with no selections."""
-        repo_url = "https://github.com/test/repo"
-        normalized_selections = {
-            "repository": False,
-            "commits": False,
-            "issues": False,
-            "pull_requests": False,
-            "contributors": False,
-            "dependencies": False,
-            "fork_lineage": False,
-            "commit_lineage": False,
-            "bus_factor": False,
-            "pr_metrics": False,
-            "issue_metrics": False,
-            "commit_activity": False,
-            "release_cadence": False
-        }
-        
-        with pytest.raises(ValueError, match="At least one metadata type must be selected"):
-            workflow._validate_inputs(repo_url, normalized_selections, "test123")
-
-    def test_build_combined_metadata_component(self, workflow):
-        """Test metadata combination component."""
-        repo_metadata = {"repository": "test/repo", "stars": 100}
-        commits = [{"sha": "1"}]
-        issues = [{"number": 1}]
-        pull_requests = [{"number": 1}]
-        contributors = [{"login": "user1"}]
-        dependencies = [{"name": "dep1"}]
-        fork_lineage = {"is_fork": False}
-        commit_lineage = {"merge_commits": []}
-        bus_factor = {"top1_pct": 0.5}
-        pr_metrics = {"merge_rate": 0.8}
-        issue_metrics = {"closure_rate": 0.6}
-        commit_activity = {"per_week": {}}
-        release_cadence = {"tag_count_100": 10}
-        
-        normalized_selections = {
-            "repository": True,
-            "commits": True,
-            "issues": False,
-            "pull_requests": True,
-            "contributors": False,
-            "dependencies": True,
-            "fork_lineage": True,
-            "commit_lineage": False,
-            "bus_factor": True,
-            "pr_metrics": False,
-            "issue_metrics": True,
-            "commit_activity": False,
-            "release_cadence": True
-        }
-        
+    @pytest.mark.parametrize("repo_metadata,inputs,normalized_selections,expected,absent", [
+        (
+            {"repository": "test/repo", "stars": 100},
+            COMBINED_INPUTS,
+            {
+                **ALL_FALSE_SELECTIONS,
+                "repository": True, "commits": True, "pull_requests": True, "dependencies": True,
+                "fork_lineage": True, "bus_factor": True, "issue_metrics": True, "release_cadence": True,
+            },
+            {
+                "repository": "test/repo",
+                "stars": 100,
+                "commits": [{"sha": "1"}],
+                "pull_requests": [{"number": 1}],
+                "dependencies": [{"name": "dep1"}],
+                "fork_lineage": {"is_fork": False},
+                "bus_factor": {"top1_pct": 0.5},
+                "issue_metrics": {"closure_rate": 0.6},
+                "release_cadence": {"tag_count_100": 10},
+            },
+            {"issues", "contributors", "commit_lineage", "pr_metrics", "commit_activity"},
+        ),
+        (
+            None,
+            {"commits": [{"sha": "1"}]},
+            {**ALL_FALSE_SELECTIONS, "commits": True},
+            {"commits": [{"sha": "1"}]},
+            {"repository", "stars"},
+        ),
+        (
+            {"repository": "test/repo"},
+            {},
+            {**ALL_FALSE_SELECTIONS, "repository": True},
+            {"repository": "test/repo"},
+            {"commits", "issues", "pull_requests"},
+        ),
+        (
+            {"repository": "test/repo"},
+            {"commits": [], "issues": [], "pull_requests": [], "contributors": [], "dependencies": []},
+            {
+                **ALL_FALSE_SELECTIONS,
+                "repository": True, "commits": True, "issues": True,
+                "pull_requests": True, "contributors": True, "dependencies": True,
+            },
+            {
+                "repository": "test/repo",
+                "commits": [],
+                "issues": [],
+                "pull_requests": [],
+                "contributors": [],
+                "dependencies": [],
+            },
+            set(),
+        ),
+        (
+            {"repository": "test/repo", "stars": 100, "forks": 50, "description": "Test repository"},
+            {},
+            {**ALL_FALSE_SELECTIONS, "repository": True},
+            {"repository": "test/repo", "stars": 100, "forks": 50, "description": "Test repository"},
+            {"commits", "issues"},
+        ),
+    ], ids=["mixed_selection", "no_repo_metadata", "repository_only", "empty_lists", "structure_preserved"])
+    def test_build_combined_metadata(self, workflow, repo_metadata, inputs, normalized_selections, expected, absent):
+        """Test metadata combination keeps selected items and drops the rest."""
+        # Inputs are keyed by metadata type; missing types are passed as None, in signature order
         result = workflow._build_combined_metadata(
-            repo_metadata, commits, issues, pull_requests, contributors, dependencies,
-            fork_lineage, commit_lineage, bus_factor, pr_metrics, issue_metrics,
-            commit_activity, release_cadence, normalized_selections
+            repo_metadata, *(inputs.get(key) for key in COMBINED_INPUTS), normalized_selections
         )
-        
-        # Check selected items are included
-        assert result["repository"] == "test/repo"
-        assert result["stars"] == 100
-        assert result["commits"] == [{"sha": "1"}]
-        assert result["pull_requests"] == [{"number": 1}]
-        assert result["dependencies"] == [{"name": "dep1"}]
-        assert result["fork_lineage"] == {"is_fork": False}
-        assert result["bus_factor"] == {"top1_pct": 0.5}
-        assert result["issue_metrics"] == {"closure_rate": 0.6}
-        assert result["release_cadence"] == {"tag_count_100": 10}
-        
-        # Check non-selected items are not included
-        assert "issues" not in result
-        assert "contributors" not in result
-        assert "commit_lineage" not in result
-        assert "pr_metrics" not in result
-        assert "commit_activity" not in result
 
-    def test_build_combined_metadata_no_repo_metadata(self, workflow):
-        """Test building combined metadata without repository metadata."""
-        normalized_selections = {
-            "repository": False,
-            "commits": True,
-            "issues": False,
-            "pull_requests": False,
-            "contributors": False,
-            "dependencies": False,
-            "fork_lineage": False,
-            "commit_lineage": False,
-            "bus_factor": False,
-            "pr_metrics": False,
-            "issue_metrics": False,
-            "commit_activity": False,
-            "release_cadence": False
-        }
-        
-        result = workflow._build_combined_metadata(
-            None, [{"sha": "1"}], None, None, None, None,
-            None, None, None, None, None, None, None, normalized_selections
-        )
-        
-        assert result["commits"] == [{"sha": "1"}]
-        assert "repository" not in result
-        assert "stars" not in result
+        for key, value in expected.items():
+            assert result[key] == value
+        assert not absent & result.keys()
 
     def test_get_activities_registration(self, workflow):
         """Test that get_activities returns correct activity list."""
-        mock_activities = Mock(spec=GitHubMetadataActivities)
+        # Bare instance skips __init__ (GitHub client, data dir); only bound methods are needed
+        bare_activities = GitHubMetadataActivities.__new__(GitHubMetadataActivities)
         
-        activities = workflow.get_activities(mock_activities)
+        activities = workflow.get_activities(bare_activities)
         
         # Should return list of activity methods
         assert isinstance(activities, list)
@@ -244,15 +201,8 @@ class TestGitHubMetadataWorkflowComponent:
         _, _, _, _, normalized_selections = workflow._extract_parameters(workflow_args, {})
         
         # Check that all metadata types are present
-        expected_keys = [
-            "repository", "commits", "issues", "pull_requests", "contributors",
-            "dependencies", "fork_lineage", "commit_lineage", "bus_factor",
-            "pr_metrics", "issue_metrics", "commit_activity", "release_cadence"
-        ]
-        
-        for key in expected_keys:
-            assert key in normalized_selections
-            assert isinstance(normalized_selections[key], bool)
+        assert _EXPECTED_KEYS <= normalized_selections.keys()
+        assert all(type(value) is bool for value in normalized_selections.values())
         
         # Check specific values
         assert normalized_selections["repository"] is True
@@ -266,10 +216,7 @@ class TestGitHubMetadataWorkflowComponent:
 
     def test_workflow_parameter_defaults(self, workflow):
         """Test workflow parameter defaults."""
-        workflow_args = {
-            "repo_url": "https://github.com/test/repo",
-            "selections": {"repository": True}
-        }
+        workflow_args = _REPOSITORY_ONLY_ARGS
         
         repo_url, commit_limit, issues_limit, pr_limit, normalized_selections = workflow._extract_parameters(
             workflow_args, {}
@@ -280,60 +227,7 @@ class TestGitHubMetadataWorkflowComponent:
         assert issues_limit == 200  # Default from config
         assert pr_limit == 200  # Default from config
         assert normalized_selections["repository"] is True
-        assert all(not value for key, value in normalized_selections.items() if key != "repository")
-
-    def test_workflow_metadata_filtering(self, workflow):
-        """Test workflow metadata filtering based on selections."""
-        # Test with only repository selected
-        normalized_selections = {
-            "repository": True,
-            "commits": False,
-            "issues": False,
-            "pull_requests": False,
-            "contributors": False,
-            "dependencies": False,
-            "fork_lineage": False,
-            "commit_lineage": False,
-            "bus_factor": False,
-            "pr_metrics": False,
-            "issue_metrics": False,
-            "commit_activity": False,
-            "release_cadence": False
-        }
-        
-        result = workflow._build_combined_metadata(
-            {"repository": "test/repo"}, None, None, None, None, None,
-            None, None, None, None, None, None, None, normalized_selections
-        )
-        
-        assert "repository" in result
-        assert "commits" not in result
-        assert "issues" not in result
-        assert "pull_requests" not in result
-
-    def test_workflow_error_scenarios(self, workflow):
-        """Test workflow error scenarios."""
-        # Test empty repo URL
-        with pytest.raises(ValueError, match="Repository URL is required"):
-            workflow._validate_inputs("", {"repository": True}, "test123")
-        
-        # Test no selections
-        with pytest.raises(ValueError, match="At least one metadata type must be selected"):
-            workflow._validate_inputs("https://github.com/test/repo", {
-                "repository": False,
-                "commits": False,
-                "issues": False,
-                "pull_requests": False,
-                "contributors": False,
-                "dependencies": False,
-                "fork_lineage": False,
-                "commit_lineage": False,
-                "bus_factor": False,
-                "pr_metrics": False,
-                "issue_metrics": False,
-                "commit_activity": False,
-                "release_cadence": False
-            }, "test123")
+        assert {key for key, value in normalized_selections.items() if value} == {"repository"}
 
     def test_workflow_component_integration(self, workflow, sample_workflow_args):
         """Test integration of workflow components."""
@@ -360,44 +254,10 @@ class TestGitHubMetadataWorkflowComponent:
         # Note: pull_requests is selected in sample_workflow_args, so it should be included
         assert "pull_requests" in result
 
-    def test_workflow_metadata_combination_edge_cases(self, workflow):
-        """Test workflow metadata combination edge cases."""
-        # Test with empty lists
-        normalized_selections = {
-            "repository": True,
-            "commits": True,
-            "issues": True,
-            "pull_requests": True,
-            "contributors": True,
-            "dependencies": True,
-            "fork_lineage": False,
-            "commit_lineage": False,
-            "bus_factor": False,
-            "pr_metrics": False,
-            "issue_metrics": False,
-            "commit_activity": False,
-            "release_cadence": False
-        }
-        
-        result = workflow._build_combined_metadata(
-            {"repository": "test/repo"}, [], [], [], [], [],
-            None, None, None, None, None, None, None, normalized_selections
-        )
-        
-        assert result["repository"] == "test/repo"
-        assert result["commits"] == []
-        assert result["issues"] == []
-        assert result["pull_requests"] == []
-        assert result["contributors"] == []
-        assert result["dependencies"] == []
-
     def test_workflow_parameter_extraction_edge_cases(self, workflow):
         """Test workflow parameter extraction edge cases."""
         # Test with missing limits
-        workflow_args = {
-            "repo_url": "https://github.com/test/repo",
-            "selections": {"repository": True}
-        }
+        workflow_args = _REPOSITORY_ONLY_ARGS
         
         repo_url, commit_limit, issues_limit, pr_limit, normalized_selections = workflow._extract_parameters(
             workflow_args, {}
@@ -408,42 +268,3 @@ class TestGitHubMetadataWorkflowComponent:
         assert issues_limit == 200  # Default
         assert pr_limit == 200  # Default
         assert normalized_selections["repository"] is True
-
-    def test_workflow_metadata_structure_validation(self, workflow):
-        """Test workflow metadata structure validation."""
-        # Test that metadata structure is maintained
-        repo_metadata = {
-            "repository": "test/repo",
-            "stars": 100,
-            "forks": 50,
-            "description": "Test repository"
-        }
-        
-        normalized_selections = {
-            "repository": True,
-            "commits": False,
-            "issues": False,
-            "pull_requests": False,
-            "contributors": False,
-            "dependencies": False,
-            "fork_lineage": False,
-            "commit_lineage": False,
-            "bus_factor": False,
-            "pr_metrics": False,
-            "issue_metrics": False,
-            "commit_activity": False,
-            "release_cadence": False
-        }
-        
-        result = workflow._build_combined_metadata(
-            repo_metadata, None, None, None, None, None,
-            None, None, None, None, None, None, None, normalized_selections
-        )
-        
-        # Verify structure is maintained
-        assert result["repository"] == "test/repo"
-        assert result["stars"] == 100
-        assert result["forks"] == 50
-        assert result["description"] == "Test repository"
-        assert "commits" not in result
-        assert "issues" not in result
@@ -4,26 +4,49 @@ Pytest configuration and shared fixtures for all tests.
 import pytest
 import asyncio
 import os
+import re
+import sys
 import tempfile
+from types import SimpleNamespace
 from unittest.mock import Mock, patch
 from datetime import datetime, timezone
 
-# Set test environment variables
-os.environ["GITHUB_TOKEN"] = "test_token"
-os.environ["METADATA_DIR"] = "extracted_metadata"
-os.environ["METADATA_UPLOAD_TO_S3"] = "false"
-os.environ["S3_BUCKET"] = "test-bucket"
-os.environ["SCHEMA_VERSION"] = "1"
-os.environ["GITHUB_API_PER_PAGE"] = "100"
-os.environ["DEFAULT_USER_AGENT"] = "test-agent"
+# Tests assert on these, parse them at import, or must never reach real GitHub/S3,
+# so always override them
+os.environ.update({
+    "GITHUB_TOKEN": "test_token",
+    "METADATA_DIR": "extracted_metadata",
+    "METADATA_UPLOAD_TO_S3": "false",
+    "S3_BUCKET": "test-bucket",
+    "SCHEMA_VERSION": "1",
+    "GITHUB_API_PER_PAGE": "100",
+})
+
+# Cosmetic default, keeping any value the CI environment already provides
+os.environ.setdefault("DEFAULT_USER_AGENT", "test-agent")
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    """Event loop policy for async tests: uvloop on POSIX, selector loop on Windows."""
+    if sys.platform == "win32":
+        return asyncio.WindowsSelectorEventLoopPolicy()
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.DefaultEventLoopPolicy()
+    return uvloop.EventLoopPolicy()
 
 
 @pytest.fixture(scope="session")
-def event_loop():
-    """Create an instance of the default event loop for the test session."""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
+def session_activities():
+    """GitHubMetadataActivities built once per session with a stubbed GitHub client."""
+    # Imported lazily so app.config reads the test environment set above
+    from app.activities import GitHubMetadataActivities
+
+    # Only __init__ builds the client, so the patch need not outlive construction
+    with patch('app.activities.Github'):
+        return GitHubMetadataActivities()
 
 
 @pytest.fixture
@@ -55,7 +78,7 @@ def mock_github_repo():
     repo.default_branch = "main"
     repo.fork = False
     repo.get_languages.return_value = {"Python": 1000, "JavaScript": 500}
-    repo.get_license.return_value = Mock(license=Mock(spdx_id="MIT"))
+    repo.get_license.return_value = SimpleNamespace(license=SimpleNamespace(spdx_id="MIT"))
     return repo
 
 
@@ -88,7 +111,7 @@ def mock_github_issues():
         issue.title = f"Test issue {i + 1}"
         issue.state = "open" if i % 2 == 0 else "closed"
         issue.user.login = "testuser"
-        issue.labels = [Mock(name="bug"), Mock(name="enhancement")]
+        issue.labels = [SimpleNamespace(name="bug"), SimpleNamespace(name="enhancement")]
         issue.created_at = datetime(2023, 1, i+1, tzinfo=timezone.utc)
         issue.closed_at = datetime(2023, 1, i+2, tzinfo=timezone.utc) if i % 2 == 1 else None
         issue.html_url = f"https://github.com/test/repo/issues/{i+1}"
@@ -205,8 +228,23 @@ def sample_frontend_request():
 
 
 # Pytest configuration
+def pytest_addoption(parser):
+    """Register opt-in profiling options."""
+    parser.addoption(
+        "--profile-async",
+        action="store_true",
+        default=False,
+        help="Profile each test with pyinstrument (async-aware) and write HTML reports to .profile/",
+    )
+
+
 def pytest_configure(config):
     """Configure pytest with custom markers."""
+    if config.getoption("--profile-async"):
+        try:
+            import pyinstrument  # noqa: F401
+        except ImportError as exc:
+            raise pytest.UsageError("--profile-async requires pyinstrument (pip install pyinstrument)") from exc
     config.addinivalue_line(
         "markers", "unit: mark test as a unit test"
     )
@@ -221,17 +259,48 @@ def pytest_configure(config):
     )
 
 
+_SLOW_DIRS = frozenset({"integration", "component"})
+
+
 def pytest_collection_modifyitems(config, items):
     """Modify test collection to add markers based on file location."""
+    unit, component, integration, perf, slow = (
+        pytest.mark.unit, pytest.mark.component, pytest.mark.integration,
+        pytest.mark.perf, pytest.mark.slow,
+    )
     for item in items:
-        # Add markers based on file location
-        if "unit" in str(item.fspath):
-            item.add_marker(pytest.mark.unit)
-        elif "component" in str(item.fspath):
-            item.add_marker(pytest.mark.component)
-        elif "integration" in str(item.fspath):
-            item.add_marker(pytest.mark.integration)
+        # Add markers based on the directories the test file lives in, relative to the
+        # rootdir so a checkout path containing "unit", "perf", etc. can't mislabel tests
+        parts = item.path.relative_to(config.rootpath).parts
+        if "unit" in parts:
+            item.add_marker(unit)
+        elif "component" in parts:
+            item.add_marker(component)
+        elif "integration" in parts:
+            item.add_marker(integration)
+        elif "perf" in parts:
+            item.add_marker(perf)
         
         # Add slow marker for tests that might be slow
-        if "integration" in str(item.fspath) or "component" in str(item.fspath):
-            item.add_marker(pytest.mark.slow)
+        if not _SLOW_DIRS.isdisjoint(parts):
+            item.add_marker(slow)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    """Wrap the test call in an async-aware profiler when --profile-async is set."""
+    if not item.config.getoption("--profile-async"):
+        yield
+        return
+
+    from pyinstrument import Profiler
+
+    profiler = Profiler(async_mode="enabled")
+    profiler.start()
+    yield
+    profiler.stop()
+
+    profile_dir = item.config.rootpath / ".profile"
+    profile_dir.mkdir(exist_ok=True)
+    report_name = re.sub(r"[^\w.-]+", "_", item.nodeid)
+    (profile_dir / f"{report_name}.html").write_text(profiler.output_html())
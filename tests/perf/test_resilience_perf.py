@@ -0,0 +1,51 @@
+"""
+Micro-benchmarks for the resilience layer (circuit breaker, caching).
+Guards the hot paths against Python-level slowdowns; correctness lives in tests/unit.
+Deselected by default (run with -m perf) and skipped unless pytest-async-benchmark is installed.
+"""
+import pytest
+
+pytest.importorskip("pytest_async_benchmark")
+
+from app import resilience
+from app.resilience import CircuitBreaker, _get_from_cache, _set_cache
+
+# Mean time per call, in seconds
+_MAX_MEAN_SECONDS = 50e-6
+# Enough samples that one slow call can't push the mean over budget
+_ROUNDS, _ITERATIONS = 20, 50
+
+
+@pytest.fixture
+def warm_cache(monkeypatch):
+    """Isolated cache holding a single unexpired entry."""
+    monkeypatch.setattr(resilience, "_cache", {})
+    _set_cache("https://github.com/test/repo", "commits", [{"sha": "1"}], limit=10)
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_closed_call(async_benchmark):
+    """Benchmark a successful call through a CLOSED breaker."""
+    breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=30, name="bench")
+
+    @breaker
+    async def noop():
+        return None
+
+    result = await async_benchmark(noop, rounds=_ROUNDS, iterations=_ITERATIONS)
+
+    assert breaker.state.value == "closed"
+    assert result["mean"] < _MAX_MEAN_SECONDS
+
+
+@pytest.mark.asyncio
+async def test_cache_hit(async_benchmark, warm_cache):
+    """Benchmark a cache lookup that hits an unexpired entry."""
+    async def lookup():
+        return _get_from_cache("https://github.com/test/repo", "commits", limit=10)
+
+    assert await lookup() == [{"sha": "1"}]
+
+    result = await async_benchmark(lookup, rounds=_ROUNDS, iterations=_ITERATIONS)
+
+    assert result["mean"] < _MAX_MEAN_SECONDS
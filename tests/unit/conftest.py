@@ -0,0 +1,41 @@
+"""
+Shared fixtures for unit tests.
+"""
+import asyncio
+import socket
+
+import pytest
+
+from app.workflow import GitHubMetadataWorkflow
+
+
+@pytest.fixture(scope="session")
+def workflow():
+    """Workflow instance shared by all unit tests."""
+    return GitHubMetadataWorkflow()
+
+
+@pytest.fixture(autouse=True)
+def no_network(monkeypatch):
+    """Fail any unit test that tries to open a network connection."""
+    def _deny(*args, **kwargs):
+        raise RuntimeError("network access in unit test")
+
+    # Patch connect rather than the class so the event loop's socketpair still works
+    monkeypatch.setattr(socket.socket, "connect", _deny)
+    monkeypatch.setattr(socket.socket, "connect_ex", _deny)
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    """Stdlib event loop for unit tests, so asyncio connects through the patched socket methods."""
+    # uvloop connects inside libuv and would bypass no_network
+    return asyncio.DefaultEventLoopPolicy()
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item):
+    """Run async unit tests on a module loop built from the policy above."""
+    # The session loop may already exist on uvloop if other suites ran first
+    if item.get_closest_marker("asyncio") is not None:
+        item.add_marker(pytest.mark.asyncio(loop_scope="module"), append=False)
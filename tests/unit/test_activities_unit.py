@@ -4,24 +4,102 @@ Tests individual methods in isolation with mocked dependencies.
 """
 import pytest
 import asyncio
-from unittest.mock import Mock, patch, AsyncMock, MagicMock
+from unittest.mock import DEFAULT, patch, MagicMock
 from datetime import datetime, timezone
 import json
 import os
+from types import SimpleNamespace
 
 from app.activities import GitHubMetadataActivities
 from app.config import METADATA_DIR
 
+# Manifest samples, built once at import
+_PACKAGE_JSON_SAMPLE = json.dumps({
+    "dependencies": {
+        "react": "^18.0.0",
+        "lodash": "^4.17.21"
+    },
+    "devDependencies": {
+        "jest": "^29.0.0"
+    }
+})
+
+_REQUIREMENTS_TXT_SAMPLE = """
+# This is a comment
+requests==2.28.0
+numpy>=1.21.0
+pandas~=1.4.0
+# Another comment
+""".strip()
+
+_POM_XML_SAMPLE = """
+<dependency>
+    <groupId>org.springframework</groupId>
+    <artifactId>spring-core</artifactId>
+    <version>5.3.0</version>
+</dependency>
+<dependency>
+    <groupId>junit</groupId>
+    <artifactId>junit</artifactId>
+    <version>4.13.2</version>
+</dependency>
+"""
+
+
+_DEFAULT_LANGUAGES = {"JavaScript": 1000, "TypeScript": 500}
+_MIT_LICENSE = SimpleNamespace(license=SimpleNamespace(spdx_id="MIT"))
+
+_REPO_DEFAULTS = {
+    "full_name": "facebook/react",
+    "html_url": "https://github.com/facebook/react",
+    "description": "A declarative, efficient, and flexible JavaScript library",
+    "language": "JavaScript",
+    "stargazers_count": 200000,
+    "forks_count": 40000,
+    "open_issues_count": 100,
+    "created_at": datetime(2013, 5, 24, tzinfo=timezone.utc),
+    "updated_at": datetime(2023, 1, 1, tzinfo=timezone.utc),
+    "default_branch": "main",
+    "fork": False,
+}
+
+
+def _make_repo(languages=_DEFAULT_LANGUAGES, license=_MIT_LICENSE, **overrides):
+    """Build a plain repository stand-in from shared defaults; unknown attributes raise AttributeError."""
+    return SimpleNamespace(
+        **{**_REPO_DEFAULTS, **overrides},
+        get_languages=lambda: languages,
+        get_license=lambda: license,
+    )
+
+
+class _AsyncFileStub:
+    """Async context manager standing in for an aiofiles file handle; records what is written."""
+
+    def __init__(self):
+        self.written = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return None
+
+    async def write(self, data):
+        self.written.append(data)
+
 
 class TestGitHubMetadataActivities:
     """Unit tests for GitHubMetadataActivities class."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def activities(self):
-        """Create activities instance with mocked dependencies."""
-        with patch('app.activities.Github'), \
-             patch('app.activities.boto3'), \
-             patch('os.makedirs'):
+        """Create activities instance with mocked dependencies; tests only stub via patch.object."""
+        with patch.multiple(
+            'app.activities',
+            Github=DEFAULT,
+            boto3=SimpleNamespace(client=lambda *args, **kwargs: SimpleNamespace()),
+        ), patch('os.makedirs', new=lambda *args, **kwargs: None):
             return GitHubMetadataActivities()
 
     @pytest.fixture
@@ -48,33 +126,23 @@ class TestGitHubMetadataActivities:
             "url": "https://github.com/test/repo/issues/1"
         }
 
-    def test_extract_repo_info_from_url_valid(self, activities):
-        """Test extracting repo info from valid GitHub URL."""
-        owner, repo = activities._extract_repo_info_from_url("https://github.com/facebook/react")
-        assert owner == "facebook"
-        assert repo == "react"
-
-    def test_extract_repo_info_from_url_with_www(self, activities):
-        """Test extracting repo info from URL with www."""
-        owner, repo = activities._extract_repo_info_from_url("https://www.github.com/microsoft/vscode")
-        assert owner == "microsoft"
-        assert repo == "vscode"
-
-    def test_extract_repo_info_from_url_trailing_slash(self, activities):
-        """Test extracting repo info from URL with trailing slash."""
-        owner, repo = activities._extract_repo_info_from_url("https://github.com/tensorflow/tensorflow/")
-        assert owner == "tensorflow"
-        assert repo == "tensorflow"
-
-    def test_extract_repo_info_from_url_invalid(self, activities):
-        """Test extracting repo info from invalid URL raises error."""
-        with pytest.raises(ValueError):
-            activities._extract_repo_info_from_url("https://gitlab.com/user/repo")
-
-    def test_extract_repo_info_from_url_malformed(self, activities):
-        """Test extracting repo info from malformed URL raises error."""
+    @pytest.mark.parametrize("url,expected", [
+        ("https://github.com/facebook/react", ("facebook", "react")),
+        ("https://www.github.com/microsoft/vscode", ("microsoft", "vscode")),
+        ("https://github.com/tensorflow/tensorflow/", ("tensorflow", "tensorflow")),
+    ], ids=["valid", "with_www", "trailing_slash"])
+    def test_extract_repo_info_from_url(self, activities, url, expected):
+        """Test extracting repo info from GitHub URLs."""
+        assert activities._extract_repo_info_from_url(url) == expected
+
+    @pytest.mark.parametrize("url", [
+        "https://gitlab.com/user/repo",
+        "https://github.com/user",
+    ], ids=["invalid", "malformed"])
+    def test_extract_repo_info_from_url_invalid(self, activities, url):
+        """Test extracting repo info from invalid or malformed URL raises error."""
         with pytest.raises(ValueError):
-            activities._extract_repo_info_from_url("https://github.com/user")
+            activities._extract_repo_info_from_url(url)
 
     def test_get_filepath(self, activities):
         """Test filepath generation."""
@@ -90,7 +158,10 @@ class TestGitHubMetadataActivities:
 
     def test_safe_call_exception(self, activities):
         """Test _safe_call with function that raises exception."""
-        result = activities._safe_call(lambda: exec("raise ValueError('test')"))
+        def _raise():
+            raise ValueError("test")
+
+        result = activities._safe_call(_raise)
         assert result is None
 
     def test_paginator_with_limit(self, activities):
@@ -123,49 +194,21 @@ class TestGitHubMetadataActivities:
 
     def test_parse_manifest_text_package_json(self, activities):
         """Test parsing package.json manifest."""
-        manifest_text = json.dumps({
-            "dependencies": {
-                "react": "^18.0.0",
-                "lodash": "^4.17.21"
-            },
-            "devDependencies": {
-                "jest": "^29.0.0"
-            }
-        })
-        result = activities._parse_manifest_text("package.json", manifest_text)
+        result = activities._parse_manifest_text("package.json", _PACKAGE_JSON_SAMPLE)
         assert len(result) == 3
         assert any(dep["name"] == "react" and dep["scope"] == "dependencies" for dep in result)
         assert any(dep["name"] == "jest" and dep["scope"] == "devDependencies" for dep in result)
 
     def test_parse_manifest_text_requirements_txt(self, activities):
         """Test parsing requirements.txt manifest."""
-        manifest_text = """
-# This is a comment
-requests==2.28.0
-numpy>=1.21.0
-pandas~=1.4.0
-# Another comment
-        """.strip()
-        result = activities._parse_manifest_text("requirements.txt", manifest_text)
+        result = activities._parse_manifest_text("requirements.txt", _REQUIREMENTS_TXT_SAMPLE)
         assert len(result) == 3
         assert any(dep["name"] == "requests" and dep["version"] == "2.28.0" for dep in result)
         assert any(dep["name"] == "numpy" and dep["version"] == "1.21.0" for dep in result)
 
     def test_parse_manifest_text_pom_xml(self, activities):
         """Test parsing pom.xml manifest."""
-        manifest_text = """
-        <dependency>
-            <groupId>org.springframework</groupId>
-            <artifactId>spring-core</artifactId>
-            <version>5.3.0</version>
-        </dependency>
-        <dependency>
-            <groupId>junit</groupId>
-            <artifactId>junit</artifactId>
-            <version>4.13.2</version>
-        </dependency>
-        """
-        result = activities._parse_manifest_text("pom.xml", manifest_text)
+        result = activities._parse_manifest_text("pom.xml", _POM_XML_SAMPLE)
         assert len(result) == 2
         assert any(dep["group"] == "org.springframework" and dep["artifact"] == "spring-core" for dep in result)
 
@@ -182,22 +225,9 @@ pandas~=1.4.0
     @pytest.mark.asyncio
     async def test_extract_repository_metadata_success(self, activities):
         """Test successful repository metadata extraction."""
-        mock_repo = Mock()
-        mock_repo.full_name = "facebook/react"
-        mock_repo.html_url = "https://github.com/facebook/react"
-        mock_repo.description = "A declarative, efficient, and flexible JavaScript library"
-        mock_repo.language = "JavaScript"
-        mock_repo.get_languages.return_value = {"JavaScript": 1000, "TypeScript": 500}
-        mock_repo.stargazers_count = 200000
-        mock_repo.forks_count = 40000
-        mock_repo.open_issues_count = 100
-        mock_repo.created_at = datetime(2013, 5, 24, tzinfo=timezone.utc)
-        mock_repo.updated_at = datetime(2023, 1, 1, tzinfo=timezone.utc)
-        mock_repo.default_branch = "main"
-        mock_repo.fork = False
-        mock_repo.get_license.return_value = Mock(license=Mock(spdx_id="MIT"))
-
-        with patch.object(activities, '_get_repo', return_value=mock_repo):
+        repo = _make_repo()
+
+        with patch.object(activities, '_get_repo', return_value=repo):
             result = await activities.extract_repository_metadata(["https://github.com/facebook/react", "test123"])
             
             assert result["repository"] == "facebook/react"
@@ -214,22 +244,20 @@ pandas~=1.4.0
     @pytest.mark.asyncio
     async def test_extract_repository_metadata_no_license(self, activities):
         """Test repository metadata extraction when no license."""
-        mock_repo = Mock()
-        mock_repo.full_name = "test/repo"
-        mock_repo.html_url = "https://github.com/test/repo"
-        mock_repo.description = None
-        mock_repo.language = None
-        mock_repo.get_languages.return_value = {}
-        mock_repo.stargazers_count = 0
-        mock_repo.forks_count = 0
-        mock_repo.open_issues_count = 0
-        mock_repo.created_at = datetime(2023, 1, 1, tzinfo=timezone.utc)
-        mock_repo.updated_at = datetime(2023, 1, 1, tzinfo=timezone.utc)
-        mock_repo.default_branch = "main"
-        mock_repo.fork = False
-        mock_repo.get_license.return_value = None
-
-        with patch.object(activities, '_get_repo', return_value=mock_repo):
+        repo = _make_repo(
+            full_name="test/repo",
+            html_url="https://github.com/test/repo",
+            description=None,
+            language=None,
+            stargazers_count=0,
+            forks_count=0,
+            open_issues_count=0,
+            created_at=datetime(2023, 1, 1, tzinfo=timezone.utc),
+            languages={},
+            license=None,
+        )
+
+        with patch.object(activities, '_get_repo', return_value=repo):
             result = await activities.extract_repository_metadata(["https://github.com/test/repo", "test123"])
             
             assert result["license"] is None
@@ -250,19 +278,18 @@ pandas~=1.4.0
         repo_url = "https://github.com/test/repo"
         extraction_id = "test123"
 
-        # Mock aiofiles.open as an async context manager
-        mock_file = AsyncMock()
-        mock_file.__aenter__ = AsyncMock(return_value=mock_file)
-        mock_file.__aexit__ = AsyncMock(return_value=None)
-        mock_file.write = AsyncMock()
+        # Stand in for aiofiles.open with a plain async context manager
+        mock_file = _AsyncFileStub()
 
-        with patch('aiofiles.open', return_value=mock_file), \
-             patch('json.dumps', return_value='{"test": "data"}') as mock_json:
-            
+        with patch('aiofiles.open', return_value=mock_file):
             result = await activities.save_metadata_to_file([metadata, repo_url, extraction_id])
-            
-            assert result.endswith(".json")
-            mock_json.assert_called_once()
+        
+        assert result.endswith(".json")
+        # Check the captured payload instead of stubbing the serializer
+        assert len(mock_file.written) == 1
+        saved = json.loads(mock_file.written[0])
+        assert saved["test"] == "data"
+        assert saved["extraction_provenance"]["file_path"] == result
 
     @pytest.mark.asyncio
     async def test_get_extraction_summary(self, activities):
@@ -0,0 +1,30 @@
+"""
+Unit tests for the unit-suite network guard in tests/unit/conftest.py.
+"""
+import asyncio
+import socket
+
+import pytest
+
+
+@pytest.fixture
+def listener():
+    """Local listening socket, so a connection would succeed if the guard let it through."""
+    server = socket.create_server(("127.0.0.1", 0))
+    yield server.getsockname()
+    server.close()
+
+
+class TestNoNetwork:
+    """Tests that unit tests cannot open network connections."""
+
+    def test_sync_connect_blocked(self, listener):
+        """Test a blocking socket connect is refused."""
+        with pytest.raises(RuntimeError, match="network access in unit test"):
+            socket.create_connection(listener, timeout=1)
+
+    @pytest.mark.asyncio
+    async def test_async_connect_blocked(self, listener):
+        """Test an event-loop connect is refused."""
+        with pytest.raises(RuntimeError, match="network access in unit test"):
+            await asyncio.open_connection(*listener)
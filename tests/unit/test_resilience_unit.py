@@ -2,12 +2,26 @@
 Unit tests for resilience patterns (circuit breaker, caching).
 """
 import pytest
-import asyncio
-import time
+from dataclasses import dataclass, field
+from typing import Any, Mapping, Tuple
 from unittest.mock import Mock, patch
+from app import resilience
 from app.resilience import CircuitBreaker, _get_from_cache, _set_cache
 
 
+class _FakeClock:
+    """Manually advanced time source for the breaker and cache clocks."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def time(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
 class TestCircuitBreaker:
     """Unit tests for CircuitBreaker class."""
 
@@ -16,7 +30,8 @@ class TestCircuitBreaker:
         breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=1.0, name="test")
         assert breaker.state.value == "closed"
 
-    def test_circuit_breaker_successful_calls(self):
+    @pytest.mark.asyncio
+    async def test_circuit_breaker_successful_calls(self):
         """Test circuit breaker with successful calls."""
         breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=1.0, name="test")
         
@@ -25,11 +40,12 @@ class TestCircuitBreaker:
             return "success"
         
         # Should work normally
-        result = asyncio.run(successful_func())
+        result = await successful_func()
         assert result == "success"
         assert breaker.state.value == "closed"
 
-    def test_circuit_breaker_failure_threshold(self):
+    @pytest.mark.asyncio
+    async def test_circuit_breaker_failure_threshold(self):
         """Test circuit breaker opens after failure threshold."""
         breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=1.0, name="test")
         
@@ -39,15 +55,16 @@ class TestCircuitBreaker:
         
         # First failure
         with pytest.raises(ValueError):
-            asyncio.run(failing_func())
+            await failing_func()
         assert breaker.state.value == "closed"
         
         # Second failure - should open
         with pytest.raises(ValueError):
-            asyncio.run(failing_func())
+            await failing_func()
         assert breaker.state.value == "open"
 
-    def test_circuit_breaker_open_state_blocks_calls(self):
+    @pytest.mark.asyncio
+    async def test_circuit_breaker_open_state_blocks_calls(self):
         """Test circuit breaker blocks calls when open."""
         breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=1.0, name="test")
         
@@ -57,15 +74,17 @@ class TestCircuitBreaker:
         
         # First failure opens the breaker
         with pytest.raises(ValueError):
-            asyncio.run(failing_func())
+            await failing_func()
         
         # Subsequent calls should be blocked
         with pytest.raises(Exception, match="Circuit breaker test is OPEN - service unavailable"):
-            asyncio.run(failing_func())
+            await failing_func()
 
-    def test_circuit_breaker_recovery_timeout(self):
+    @pytest.mark.asyncio
+    async def test_circuit_breaker_recovery_timeout(self):
         """Test circuit breaker recovery after timeout."""
-        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.1, name="test")
+        clock = _FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.1, name="test", time_source=clock.time)
         
         @breaker
         async def failing_func():
@@ -73,21 +92,23 @@ class TestCircuitBreaker:
         
         # Open the breaker
         with pytest.raises(ValueError):
-            asyncio.run(failing_func())
+            await failing_func()
         
-        # Wait for recovery timeout
-        time.sleep(0.2)
+        # Advance past recovery timeout
+        clock.advance(0.2)
         
         # Make another call - this should transition to half_open
         with pytest.raises(ValueError):
-            asyncio.run(failing_func())
+            await failing_func()
         
         # Should be in OPEN state after the call (fails again)
         assert breaker.state.value == "open"
 
-    def test_circuit_breaker_half_open_success(self):
+    @pytest.mark.asyncio
+    async def test_circuit_breaker_half_open_success(self):
         """Test circuit breaker closes after successful call in half-open state."""
-        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.1, name="test")
+        clock = _FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.1, name="test", time_source=clock.time)
         
         call_count = {"count": 0}
         
@@ -100,19 +121,21 @@ class TestCircuitBreaker:
         
         # First call fails, opens breaker
         with pytest.raises(ValueError):
-            asyncio.run(conditional_func())
+            await conditional_func()
         
-        # Wait for recovery
-        time.sleep(0.2)
+        # Advance past recovery
+        clock.advance(0.2)
         
         # Second call should succeed and close breaker
-        result = asyncio.run(conditional_func())
+        result = await conditional_func()
         assert result == "success"
         assert breaker.state.value == "closed"
 
-    def test_circuit_breaker_half_open_failure(self):
+    @pytest.mark.asyncio
+    async def test_circuit_breaker_half_open_failure(self):
         """Test circuit breaker reopens after failure in half-open state."""
-        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.1, name="test")
+        clock = _FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.1, name="test", time_source=clock.time)
         
         @breaker
         async def failing_func():
@@ -120,18 +143,19 @@ class TestCircuitBreaker:
         
         # Open the breaker
         with pytest.raises(ValueError):
-            asyncio.run(failing_func())
+            await failing_func()
         
-        # Wait for recovery
-        time.sleep(0.2)
+        # Advance past recovery
+        clock.advance(0.2)
         
         # Call should fail and reopen breaker
         with pytest.raises(ValueError):
-            asyncio.run(failing_func())
+            await failing_func()
         
         assert breaker.state.value == "open"
 
-    def test_circuit_breaker_different_functions(self):
+    @pytest.mark.asyncio
+    async def test_circuit_breaker_different_functions(self):
         """Test circuit breaker with different functions."""
         breaker1 = CircuitBreaker(failure_threshold=1, recovery_timeout=1.0, name="test1")
         breaker2 = CircuitBreaker(failure_threshold=1, recovery_timeout=1.0, name="test2")
@@ -146,140 +170,129 @@ class TestCircuitBreaker:
         
         # func1 should open its breaker
         with pytest.raises(ValueError):
-            asyncio.run(func1())
+            await func1()
         assert breaker1.state.value == "open"
         
         # func2 should work normally
-        result = asyncio.run(func2())
+        result = await func2()
         assert result == "success"
         assert breaker2.state.value == "closed"
 
 
-class TestCaching:
-    """Unit tests for caching functionality."""
+_COMPLEX_VALUE = {
+    "list": [1, 2, 3],
+    "dict": {"nested": "value"},
+    "string": "test",
+    "number": 42,
+    "boolean": True,
+    "none": None
+}
 
-    def test_set_and_get_cache(self):
-        """Test basic cache set and get functionality."""
-        key = "test_key"
-        value = {"data": "test"}
-        ttl = 60
-        
-        _set_cache(key, "test_type", value, ttl=ttl)
-        result = _get_from_cache(key, "test_type")
-        
-        assert result == value
 
-    def test_cache_miss(self):
-        """Test cache miss returns None."""
-        result = _get_from_cache("nonexistent_key", "test_type")
-        assert result is None
+@dataclass(frozen=True)
+class _CacheWrite:
+    key: str
+    activity_type: str
+    value: Any
+    ttl: float = 60
+    params: Mapping[str, Any] = field(default_factory=dict)
 
-    def test_cache_with_parameters(self):
-        """Test cache with additional parameters."""
-        key = "test_key"
-        value = {"data": "test"}
-        params = {"limit": 50, "offset": 0}
-        
-        _set_cache(key, "test_type", value, ttl=60, **params)
-        result = _get_from_cache(key, "test_type", **params)
-        
-        assert result == value
 
-    def test_cache_parameter_mismatch(self):
-        """Test cache miss when parameters don't match."""
-        key = "test_key"
-        value = {"data": "test"}
-        
-        _set_cache(key, "test_type", value, ttl=60, limit=50)
-        result = _get_from_cache(key, "test_type", limit=100)  # Different limit
-        
-        assert result is None
+@dataclass(frozen=True)
+class _CacheRead:
+    key: str
+    activity_type: str
+    expected: Any
+    params: Mapping[str, Any] = field(default_factory=dict)
 
-    def test_cache_ttl_expiration(self):
-        """Test cache TTL expiration."""
-        key = "test_key"
-        value = {"data": "test"}
-        ttl = 0.1  # Very short TTL
-        
-        _set_cache(key, "test_type", value, ttl=ttl)
-        
-        # Should be available immediately
-        result = _get_from_cache(key, "test_type")
-        assert result == value
-        
-        # Wait for expiration
-        time.sleep(0.2)
-        
-        # Should be None after expiration
-        result = _get_from_cache(key, "test_type")
-        assert result is None
 
-    def test_cache_different_types(self):
-        """Test cache with different types."""
-        key = "test_key"
-        value1 = {"data": "test1"}
-        value2 = {"data": "test2"}
-        
-        _set_cache(key, "type1", value1, ttl=60)
-        _set_cache(key, "type2", value2, ttl=60)
-        
-        result1 = _get_from_cache(key, "type1")
-        result2 = _get_from_cache(key, "type2")
-        
-        assert result1 == value1
-        assert result2 == value2
+@dataclass(frozen=True)
+class _CacheScenario:
+    """Writes, reads, then optionally advance the clock and read again."""
+    writes: Tuple[_CacheWrite, ...]
+    reads: Tuple[_CacheRead, ...] = ()
+    advance: float = 0.0
+    reads_after_advance: Tuple[_CacheRead, ...] = ()
 
-    def test_cache_overwrite(self):
-        """Test cache overwrite functionality."""
-        key = "test_key"
-        value1 = {"data": "test1"}
-        value2 = {"data": "test2"}
-        
-        _set_cache(key, "test_type", value1, ttl=60)
-        _set_cache(key, "test_type", value2, ttl=60)
-        
-        result = _get_from_cache(key, "test_type")
-        assert result == value2
 
-    def test_cache_cleanup(self):
-        """Test cache cleanup of expired entries."""
-        key1 = "test_key1"
-        key2 = "test_key2"
-        value = {"data": "test"}
-        
-        # Set with different TTLs
-        _set_cache(key1, "test_type", value, ttl=0.1)  # Short TTL
-        _set_cache(key2, "test_type", value, ttl=60)   # Long TTL
-        
-        # Wait for first to expire
-        time.sleep(0.2)
-        
-        # First should be None, second should still be available
-        result1 = _get_from_cache(key1, "test_type")
-        result2 = _get_from_cache(key2, "test_type")
-        
-        assert result1 is None
-        assert result2 == value
+_CACHE_SCENARIOS = {
+    "set_and_get": _CacheScenario(
+        writes=(_CacheWrite("test_key", "test_type", {"data": "test"}),),
+        reads=(_CacheRead("test_key", "test_type", {"data": "test"}),),
+    ),
+    "miss": _CacheScenario(
+        writes=(),
+        reads=(_CacheRead("nonexistent_key", "test_type", None),),
+    ),
+    "with_parameters": _CacheScenario(
+        writes=(_CacheWrite("test_key", "test_type", {"data": "test"}, params={"limit": 50, "offset": 0}),),
+        reads=(_CacheRead("test_key", "test_type", {"data": "test"}, params={"limit": 50, "offset": 0}),),
+    ),
+    "parameter_mismatch": _CacheScenario(
+        writes=(_CacheWrite("test_key", "test_type", {"data": "test"}, params={"limit": 50}),),
+        reads=(_CacheRead("test_key", "test_type", None, params={"limit": 100}),),
+    ),
+    "ttl_expiration": _CacheScenario(
+        writes=(_CacheWrite("test_key", "test_type", {"data": "test"}, ttl=0.1),),
+        reads=(_CacheRead("test_key", "test_type", {"data": "test"}),),
+        advance=0.2,
+        reads_after_advance=(_CacheRead("test_key", "test_type", None),),
+    ),
+    "different_types": _CacheScenario(
+        writes=(
+            _CacheWrite("test_key", "type1", {"data": "test1"}),
+            _CacheWrite("test_key", "type2", {"data": "test2"}),
+        ),
+        reads=(
+            _CacheRead("test_key", "type1", {"data": "test1"}),
+            _CacheRead("test_key", "type2", {"data": "test2"}),
+        ),
+    ),
+    "overwrite": _CacheScenario(
+        writes=(
+            _CacheWrite("test_key", "test_type", {"data": "test1"}),
+            _CacheWrite("test_key", "test_type", {"data": "test2"}),
+        ),
+        reads=(_CacheRead("test_key", "test_type", {"data": "test2"}),),
+    ),
+    "cleanup": _CacheScenario(
+        writes=(
+            _CacheWrite("test_key1", "test_type", {"data": "test"}, ttl=0.1),
+            _CacheWrite("test_key2", "test_type", {"data": "test"}, ttl=60),
+        ),
+        advance=0.2,
+        reads_after_advance=(
+            _CacheRead("test_key1", "test_type", None),
+            _CacheRead("test_key2", "test_type", {"data": "test"}),
+        ),
+    ),
+    "complex_data": _CacheScenario(
+        writes=(_CacheWrite("test_key", "test_type", _COMPLEX_VALUE),),
+        reads=(_CacheRead("test_key", "test_type", _COMPLEX_VALUE),),
+    ),
+}
 
-    def test_cache_with_complex_data(self):
-        """Test cache with complex data structures."""
-        key = "test_key"
-        value = {
-            "list": [1, 2, 3],
-            "dict": {"nested": "value"},
-            "string": "test",
-            "number": 42,
-            "boolean": True,
-            "none": None
-        }
-        
-        _set_cache(key, "test_type", value, ttl=60)
-        result = _get_from_cache(key, "test_type")
-        
-        assert result == value
-        assert result["list"] == [1, 2, 3]
-        assert result["dict"]["nested"] == "value"
-        assert result["string"] == "test"
-        assert result["number"] == 42
-        assert result["boolean"] is True
-        assert result["none"] is None
+
+class TestCaching:
+    """Unit tests for caching functionality."""
+
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        """Fake cache clock advanced manually instead of sleeping; starts from an empty cache."""
+        clock = _FakeClock()
+        monkeypatch.setattr(resilience, "_now", clock.time)
+        monkeypatch.setattr(resilience, "_cache", {})
+        return clock
+
+    @pytest.mark.parametrize("scenario", _CACHE_SCENARIOS.values(), ids=_CACHE_SCENARIOS.keys())
+    def test_cache_scenario(self, clock, scenario):
+        """Test cache set/get round trips, misses, parameter keys and TTL expiry."""
+        for write in scenario.writes:
+            _set_cache(write.key, write.activity_type, write.value, ttl=write.ttl, **write.params)
+
+        for read in scenario.reads:
+            assert _get_from_cache(read.key, read.activity_type, **read.params) == read.expected
+
+        clock.advance(scenario.advance)
+        for read in scenario.reads_after_advance:
+            assert _get_from_cache(read.key, read.activity_type, **read.params) == read.expected
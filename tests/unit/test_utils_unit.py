@@ -51,104 +51,45 @@ class TestUtils:
         result = safe_isoformat(123)
         assert result == "123"  # Should convert to string
 
-    def test_parse_repo_url_valid(self):
-        """Test parsing valid GitHub URL."""
-        owner, repo = parse_repo_url("https://github.com/facebook/react")
-        assert owner == "facebook"
-        assert repo == "react"
-
-    def test_parse_repo_url_with_www(self):
-        """Test parsing URL with www."""
-        owner, repo = parse_repo_url("https://www.github.com/microsoft/vscode")
-        assert owner == "microsoft"
-        assert repo == "vscode"
-
-    def test_parse_repo_url_with_trailing_slash(self):
-        """Test parsing URL with trailing slash."""
-        owner, repo = parse_repo_url("https://github.com/tensorflow/tensorflow/")
-        assert owner == "tensorflow"
-        assert repo == "tensorflow"
-
-    def test_parse_repo_url_with_dot_git(self):
-        """Test parsing URL with .git extension."""
-        owner, repo = parse_repo_url("https://github.com/facebook/react.git")
-        assert owner == "facebook"
-        assert repo == "react"
-
-    def test_parse_repo_url_invalid_host(self):
-        """Test parsing URL with invalid host."""
-        with pytest.raises(ValueError, match="Unsupported host; only github.com is allowed"):
-            parse_repo_url("https://gitlab.com/user/repo")
-
-    def test_parse_repo_url_malformed(self):
-        """Test parsing malformed URL."""
-        with pytest.raises(ValueError, match="Malformed GitHub URL"):
-            parse_repo_url("https://github.com/user")
-
-    def test_parse_repo_url_insufficient_parts(self):
-        """Test parsing URL with insufficient parts."""
-        with pytest.raises(ValueError, match="Malformed GitHub URL"):
-            parse_repo_url("https://github.com")
-
-    def test_parse_repo_url_http(self):
-        """Test parsing HTTP URL."""
-        owner, repo = parse_repo_url("http://github.com/facebook/react")
-        assert owner == "facebook"
-        assert repo == "react"
-
-    def test_parse_repo_url_with_subdomain(self):
-        """Test parsing URL with subdomain."""
-        owner, repo = parse_repo_url("https://github.com/facebook/react")
-        assert owner == "facebook"
-        assert repo == "react"
-
-    def test_parse_repo_url_with_query_params(self):
-        """Test parsing URL with query parameters."""
-        owner, repo = parse_repo_url("https://github.com/facebook/react?tab=repositories")
-        assert owner == "facebook"
-        assert repo == "react"
-
-    def test_parse_repo_url_with_fragment(self):
-        """Test parsing URL with fragment."""
-        owner, repo = parse_repo_url("https://github.com/facebook/react#readme")
-        assert owner == "facebook"
-        assert repo == "react"
-
-    def test_parse_repo_url_empty_string(self):
-        """Test parsing empty string."""
-        with pytest.raises(ValueError, match="Unsupported repo URL format"):
-            parse_repo_url("")
-
-    def test_parse_repo_url_none(self):
-        """Test parsing None."""
-        with pytest.raises(AttributeError):
-            parse_repo_url(None)
-
-    def test_parse_repo_url_git_ssh(self):
-        """Test parsing git SSH URL."""
-        owner, repo = parse_repo_url("git@github.com:facebook/react.git")
-        assert owner == "facebook"
-        assert repo == "react"
-
-    def test_parse_repo_url_git_ssh_without_git(self):
-        """Test parsing git SSH URL without .git extension."""
-        owner, repo = parse_repo_url("git@github.com:facebook/react")
-        assert owner == "facebook"
-        assert repo == "react"
-
-    def test_parse_repo_url_simple_format(self):
-        """Test parsing simple owner/repo format."""
-        owner, repo = parse_repo_url("facebook/react")
-        assert owner == "facebook"
-        assert repo == "react"
-
-    def test_parse_repo_url_simple_format_with_git(self):
-        """Test parsing simple owner/repo.git format."""
-        owner, repo = parse_repo_url("facebook/react.git")
-        assert owner == "facebook"
-        assert repo == "react"
-
-    def test_parse_repo_url_invalid_git_ssh(self):
-        """Test parsing invalid git SSH URL."""
-        with pytest.raises(ValueError, match="Unsupported git SSH URL; only github.com is allowed"):
-            parse_repo_url("git@gitlab.com:user/repo.git")
+    @pytest.mark.parametrize("url,expected", [
+        ("https://github.com/facebook/react", ("facebook", "react")),
+        ("https://www.github.com/microsoft/vscode", ("microsoft", "vscode")),
+        ("https://github.com/tensorflow/tensorflow/", ("tensorflow", "tensorflow")),
+        ("https://github.com/facebook/react.git", ("facebook", "react")),
+        ("http://github.com/facebook/react", ("facebook", "react")),
+        ("https://github.com/facebook/react?tab=repositories", ("facebook", "react")),
+        ("https://github.com/facebook/react#readme", ("facebook", "react")),
+        ("git@github.com:facebook/react.git", ("facebook", "react")),
+        ("git@github.com:facebook/react", ("facebook", "react")),
+        ("facebook/react", ("facebook", "react")),
+        ("facebook/react.git", ("facebook", "react")),
+    ], ids=[
+        "https", "www", "trailing_slash", "dot_git", "http", "query_params", "fragment",
+        "git_ssh", "git_ssh_without_git", "simple_format", "simple_format_with_git",
+    ])
+    def test_parse_repo_url(self, url, expected):
+        """Test parsing supported GitHub URL forms into (owner, repo)."""
+        assert parse_repo_url(url) == expected
+
+    @pytest.mark.parametrize("url,exc,match", [
+        ("https://gitlab.com/user/repo", ValueError, "Unsupported host; only github.com is allowed"),
+        ("https://github.com/user", ValueError, "Malformed GitHub URL"),
+        ("https://github.com", ValueError, "Malformed GitHub URL"),
+        ("", ValueError, "Unsupported repo URL format"),
+        (None, AttributeError, None),
+        ("git@gitlab.com:user/repo.git", ValueError, "Unsupported git SSH URL; only github.com is allowed"),
+    ], ids=["invalid_host", "malformed", "insufficient_parts", "empty_string", "none", "invalid_git_ssh"])
+    def test_parse_repo_url_errors(self, url, exc, match):
+        """Test parsing unsupported or malformed URLs raises."""
+        with pytest.raises(exc, match=match):
+            parse_repo_url(url)
+
+    def test_parse_repo_url_is_memoized(self):
+        """Test repeated parses of the same URL are served from the cache."""
+        parse_repo_url.cache_clear()
+        first = parse_repo_url("https://github.com/facebook/react")
+        second = parse_repo_url("https://github.com/facebook/react")
+        assert first == second == ("facebook", "react")
+        info = parse_repo_url.cache_info()
+        assert info.misses == 1
+        assert info.hits == 1
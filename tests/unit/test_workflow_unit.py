@@ -3,238 +3,96 @@ Unit tests for GitHubMetadataWorkflow class.
 Tests individual workflow methods in isolation.
 """
 import pytest
-from unittest.mock import Mock, patch, AsyncMock
-from datetime import timedelta
+from types import MappingProxyType
 
-from app.workflow import GitHubMetadataWorkflow
+from app.config import (
+    WORKFLOW_DEFAULT_COMMIT_LIMIT,
+    WORKFLOW_DEFAULT_ISSUES_LIMIT,
+    WORKFLOW_DEFAULT_PR_LIMIT,
+)
+from workflow_samples import ALL_FALSE_SELECTIONS, COMBINED_INPUTS
 
 
-class TestGitHubMetadataWorkflow:
-    """Unit tests for GitHubMetadataWorkflow class."""
+def _mask(*true_keys):
+    """Build a full selections dict with only the given keys set to True."""
+    return {**ALL_FALSE_SELECTIONS, **dict.fromkeys(true_keys, True)}
 
-    @pytest.fixture
-    def workflow(self):
-        """Create workflow instance."""
-        return GitHubMetadataWorkflow()
 
-    @pytest.fixture
-    def sample_workflow_args(self):
-        """Sample workflow arguments."""
-        return {
-            "repo_url": "https://github.com/test/repo",
-            "commit_limit": 50,
-            "issues_limit": 30,
-            "pr_limit": 20,
-            "selections": {
-                "repository": True,
-                "commits": True,
-                "issues": False,
-                "pull_requests": True,
-                "contributors": False,
-                "dependencies": True,
-                "fork_lineage": False,
-                "commit_lineage": False,
-                "bus_factor": False,
-                "pr_metrics": False,
-                "issue_metrics": False,
-                "commit_activity": False,
-                "release_cadence": False
-            }
-        }
+_MIXED_SELECTIONS = MappingProxyType(_mask(
+    "repository", "commits", "issues", "contributors",
+    "fork_lineage", "bus_factor", "issue_metrics", "release_cadence",
+))
 
-    def test_extract_parameters(self, workflow):
-        """Test parameter extraction from workflow args."""
-        workflow_args = {
-            "repo_url": "https://github.com/test/repo",
-            "commit_limit": 100,
-            "issues_limit": 50,
-            "pr_limit": 25,
-            "selections": {
-                "repository": True,
-                "commits": True,
-                "issues": True,
-                "pull_requests": False,
-                "contributors": True,
-                "dependencies": False,
-                "fork_lineage": True,
-                "commit_lineage": False,
-                "bus_factor": True,
-                "pr_metrics": False,
-                "issue_metrics": True,
-                "commit_activity": False,
-                "release_cadence": True
-            }
-        }
-        
-        repo_url, commit_limit, issues_limit, pr_limit, normalized_selections = workflow._extract_parameters(
-            workflow_args, {}
-        )
-        
-        assert repo_url == "https://github.com/test/repo"
-        assert commit_limit == 100
-        assert issues_limit == 50
-        assert pr_limit == 25
-        assert normalized_selections["repository"] is True
-        assert normalized_selections["commits"] is True
-        assert normalized_selections["issues"] is True
-        assert normalized_selections["pull_requests"] is False
-        assert normalized_selections["fork_lineage"] is True
-        assert normalized_selections["bus_factor"] is True
+# Repository metadata passed alongside COMBINED_INPUTS when "repository" is selected
+_REPO_METADATA = MappingProxyType({"repository": "test/repo", "stars": 100})
 
-    def test_extract_parameters_with_defaults(self, workflow):
-        """Test parameter extraction with default values."""
-        workflow_args = {
-            "repo_url": "https://github.com/test/repo",
-            "selections": {}
-        }
-        
+
+class TestGitHubMetadataWorkflow:
+    """Unit tests for GitHubMetadataWorkflow class."""
+
+    @pytest.mark.parametrize("workflow_args,expected_limits,expected_selections", [
+        (
+            {
+                "repo_url": "https://github.com/test/repo",
+                "commit_limit": 100,
+                "issues_limit": 50,
+                "pr_limit": 25,
+                "selections": _MIXED_SELECTIONS,
+            },
+            (100, 50, 25),
+            _MIXED_SELECTIONS,
+        ),
+        (
+            {"repo_url": "https://github.com/test/repo", "selections": {}},
+            (WORKFLOW_DEFAULT_COMMIT_LIMIT, WORKFLOW_DEFAULT_ISSUES_LIMIT, WORKFLOW_DEFAULT_PR_LIMIT),
+            ALL_FALSE_SELECTIONS,  # All selections should default to False
+        ),
+    ], ids=["explicit", "defaults"])
+    def test_extract_parameters(self, workflow, workflow_args, expected_limits, expected_selections):
+        """Test parameter extraction from workflow args, with and without explicit limits."""
         repo_url, commit_limit, issues_limit, pr_limit, normalized_selections = workflow._extract_parameters(
             workflow_args, {}
         )
         
-        assert repo_url == "https://github.com/test/repo"
-        assert commit_limit == 200  # Default from config
-        assert issues_limit == 200  # Default from config
-        assert pr_limit == 200  # Default from config
-        # All selections should default to False
-        assert all(not value for value in normalized_selections.values())
+        assert (repo_url, commit_limit, issues_limit, pr_limit) == ("https://github.com/test/repo", *expected_limits)
+        assert normalized_selections == expected_selections
 
     def test_validate_inputs_valid(self, workflow):
         """Test input validation with valid inputs."""
-        repo_url = "https://github.com/test/repo"
-        normalized_selections = {
-            "repository": True,
-            "commits": False,
-            "issues": True,
-            "pull_requests": False,
-            "contributors": False,
-            "dependencies": False,
-            "fork_lineage": False,
-            "commit_lineage": False,
-            "bus_factor": False,
-            "pr_metrics": False,
-            "issue_metrics": False,
-            "commit_activity": False,
-            "release_cadence": False
-        }
-        
         # Should not raise exception
-        workflow._validate_inputs(repo_url, normalized_selections, "test123")
-
-    def test_validate_inputs_no_repo_url(self, workflow):
-        """Test input validation with missing repo URL."""
-        repo_url = ""
-        normalized_selections = {"repository": True}
-        
-        with pytest.raises(ValueError, match="Repository URL is required"):
-            workflow._validate_inputs(repo_url, normalized_selections, "test123")
+        workflow._validate_inputs("https://github.com/test/repo", _mask("repository", "issues"), "test123")
 
-    def test_validate_inputs_no_selections(self, workflow):
-        """Test input validation with no selections."""
-        repo_url = "https://github.com/test/repo"
-        normalized_selections = {
-            "repository": False,
-            "commits": False,
-            "issues": False,
-            "pull_requests": False,
-            "contributors": False,
-            "dependencies": False,
-            "fork_lineage": False,
-            "commit_lineage": False,
-            "bus_factor": False,
-            "pr_metrics": False,
-            "issue_metrics": False,
-            "commit_activity": False,
-            "release_cadence": False
-        }
-        
-        with pytest.raises(ValueError, match="At least one metadata type must be selected"):
+    @pytest.mark.parametrize("repo_url,normalized_selections,match", [
+        ("", {"repository": True}, "Repository URL is required"),
+        ("https://github.com/test/repo", _mask(), "At least one metadata type must be selected"),
+    ], ids=["no_repo_url", "no_selections"])
+    def test_validate_inputs_errors(self, workflow, repo_url, normalized_selections, match):
+        """Test input validation rejects missing repo URL and empty selections."""
+        with pytest.raises(ValueError, match=match):
             workflow._validate_inputs(repo_url, normalized_selections, "test123")
 
-    def test_build_combined_metadata(self, workflow):
-        """Test building combined metadata with selected items."""
-        repo_metadata = {"repository": "test/repo", "stars": 100}
-        commits = [{"sha": "1"}]
-        issues = [{"number": 1}]
-        pull_requests = [{"number": 1}]
-        contributors = [{"login": "user1"}]
-        dependencies = [{"name": "dep1"}]
-        fork_lineage = {"is_fork": False}
-        commit_lineage = {"merge_commits": []}
-        bus_factor = {"top1_pct": 0.5}
-        pr_metrics = {"merge_rate": 0.8}
-        issue_metrics = {"closure_rate": 0.6}
-        commit_activity = {"per_week": {}}
-        release_cadence = {"tag_count_100": 10}
-        
-        normalized_selections = {
-            "repository": True,
-            "commits": True,
-            "issues": False,
-            "pull_requests": True,
-            "contributors": False,
-            "dependencies": True,
-            "fork_lineage": True,
-            "commit_lineage": False,
-            "bus_factor": True,
-            "pr_metrics": False,
-            "issue_metrics": True,
-            "commit_activity": False,
-            "release_cadence": True
-        }
-        
-        result = workflow._build_combined_metadata(
-            repo_metadata, commits, issues, pull_requests, contributors, dependencies,
-            fork_lineage, commit_lineage, bus_factor, pr_metrics, issue_metrics,
-            commit_activity, release_cadence, normalized_selections
-        )
-        
-        # Check selected items are included
-        assert result["repository"] == "test/repo"
-        assert result["stars"] == 100
-        assert result["commits"] == [{"sha": "1"}]
-        assert result["pull_requests"] == [{"number": 1}]
-        assert result["dependencies"] == [{"name": "dep1"}]
-        assert result["fork_lineage"] == {"is_fork": False}
-        assert result["bus_factor"] == {"top1_pct": 0.5}
-        assert result["issue_metrics"] == {"closure_rate": 0.6}
-        assert result["release_cadence"] == {"tag_count_100": 10}
-        
-        # Check non-selected items are not included
-        assert "issues" not in result
-        assert "contributors" not in result
-        assert "commit_lineage" not in result
-        assert "pr_metrics" not in result
-        assert "commit_activity" not in result
-
-    def test_build_combined_metadata_no_repo_metadata(self, workflow):
-        """Test building combined metadata without repository metadata."""
-        normalized_selections = {
-            "repository": False,
-            "commits": True,
-            "issues": False,
-            "pull_requests": False,
-            "contributors": False,
-            "dependencies": False,
-            "fork_lineage": False,
-            "commit_lineage": False,
-            "bus_factor": False,
-            "pr_metrics": False,
-            "issue_metrics": False,
-            "commit_activity": False,
-            "release_cadence": False
-        }
+    @pytest.mark.parametrize("normalized_selections", [
+        _mask(
+            "repository", "commits", "pull_requests", "dependencies",
+            "fork_lineage", "bus_factor", "issue_metrics", "release_cadence",
+        ),
+        _mask("commits"),
+        _mask(*ALL_FALSE_SELECTIONS),
+    ], ids=["mixed_selection", "no_repo_metadata", "all_selected"])
+    def test_build_combined_metadata(self, workflow, normalized_selections):
+        """Test combined metadata holds exactly the selected items."""
+        # Repository metadata is only fetched, and so only passed, when selected
+        repo_metadata = _REPO_METADATA if normalized_selections["repository"] else None
         
-        result = workflow._build_combined_metadata(
-            None, [{"sha": "1"}], None, None, None, None,
-            None, None, None, None, None, None, None, normalized_selections
-        )
+        result = workflow._build_combined_metadata(repo_metadata, *COMBINED_INPUTS.values(), normalized_selections)
         
-        assert result["commits"] == [{"sha": "1"}]
-        assert "repository" not in result
-        assert "stars" not in result
+        expected = {key: value for key, value in COMBINED_INPUTS.items() if normalized_selections[key]}
+        if repo_metadata is not None:
+            expected.update(repo_metadata)
+        assert result == expected
 
     def test_get_activities_wrong_type(self, workflow):
         """Test get_activities with wrong activity type."""
-        with pytest.raises(TypeError, match="Activities must be an instance of GitHubMetadataActivities"):
+        with pytest.raises(TypeError) as exc_info:
             workflow.get_activities("not_an_activities_instance")
+        assert str(exc_info.value) == "Activities must be an instance of GitHubMetadataActivities"
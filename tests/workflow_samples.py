@@ -0,0 +1,27 @@
+"""
+Read-only sample data shared by the workflow unit and component tests.
+"""
+from types import MappingProxyType
+
+# Every metadata type the workflow normalizes, all deselected
+ALL_FALSE_SELECTIONS = MappingProxyType(dict.fromkeys([
+    "repository", "commits", "issues", "pull_requests", "contributors",
+    "dependencies", "fork_lineage", "commit_lineage", "bus_factor",
+    "pr_metrics", "issue_metrics", "commit_activity", "release_cadence"
+], False))
+
+# Sample _build_combined_metadata inputs, keyed by type in signature order after repo_metadata
+COMBINED_INPUTS = MappingProxyType({
+    "commits": [{"sha": "1"}],
+    "issues": [{"number": 1}],
+    "pull_requests": [{"number": 1}],
+    "contributors": [{"login": "user1"}],
+    "dependencies": [{"name": "dep1"}],
+    "fork_lineage": {"is_fork": False},
+    "commit_lineage": {"merge_commits": []},
+    "bus_factor": {"top1_pct": 0.5},
+    "pr_metrics": {"merge_rate": 0.8},
+    "issue_metrics": {"closure_rate": 0.6},
+    "commit_activity": {"per_week": {}},
+    "release_cadence": {"tag_count_100": 10},
+})